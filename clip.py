@@ -24,6 +24,7 @@
 """
 
 import os
+from copy import deepcopy
 
 import maya.cmds as cmds
 
@@ -92,10 +93,79 @@ def equal_attributes(a, b):
         return a == b
 
 
-def iterate_mapping_recursive(mapping_dict, xml_group, node):
+def index_parameters(xml_group):
+    """
+    Index the group parameters found under the "parameters" group by name.
+    The first match is kept like xml_group.find() does
+    """
+    parameters = {}
+    for group in xml_group.findall(".//group_parameter[@name='parameters']"):
+        for parameter in group.iter("group_parameter"):
+            if parameter is not group:
+                parameters.setdefault(parameter.get("name"), parameter)
+    return parameters
+
+
+# Decoded mapping values keyed by id() of their mapping dictionary.
+# The mapping is kept with its entries so the id can't be reused,
+# the cache is reset on every export when the renderer is reloaded
+_COMPILED_MAPPINGS = {}
+# Decoded value of the attributes copied as is
+_PLAIN_ENTRY = (None, None, None, None, False)
+
+
+def compile_mapping(mapping_dict):
+    """
+    Decode the values of a mapping dictionary once into
+    {Maya attribute: (Katana parameter or None if the same,
+    options, process function, nested mapping, is rename)}
+    """
+    cached = _COMPILED_MAPPINGS.get(id(mapping_dict))
+    if cached is not None and cached[0] is mapping_dict:
+        return cached[1]
+    entries = {}
+    for param_key, param_children in mapping_dict.items():
+        if param_children is None:
+            # Most of the attributes are mapped as is
+            entries[param_key] = _PLAIN_ENTRY
+            continue
+        dest_key = None
+        options = None
+        process_field = None
+        is_rename = False
+        if isinstance(param_children, tuple) and isinstance(
+            param_children[-1], (list, tuple)
+        ):
+            # (Katana parameter name, options)
+            dest_key = param_children[0]
+            param_children = param_children[1]
+        if isinstance(param_children, (list, tuple)):
+            # Options may be given either as a list or as a tuple
+            options = param_children
+            param_children = None
+        if isinstance(param_children, str):
+            dest_key = param_children
+            param_children = None
+            is_rename = True
+        if callable(param_children):
+            process_field = param_children
+            param_children = None
+        entries[param_key] = (
+            dest_key,
+            options,
+            process_field,
+            param_children,
+            is_rename,
+        )
+    _COMPILED_MAPPINGS[id(mapping_dict)] = (mapping_dict, entries)
+    return entries
+
+
+def iterate_mapping_recursive(mapping_dict, xml_group, node, parameters=None):
     """
     The most complicated part that maps
-    Maya parameters to Katana XML parameters
+    Maya parameters to Katana XML parameters.
+    The parameters index is built once and shared by the nested groups
     """
     attributes = node["attributes"]
     mapping = dict(mapping_dict)
@@ -115,33 +185,22 @@ def iterate_mapping_recursive(mapping_dict, xml_group, node):
         xml_group.attrib["ns_colorr"] = str(custom_option[0])
         xml_group.attrib["ns_colorg"] = str(custom_option[1])
         xml_group.attrib["ns_colorb"] = str(custom_option[2])
-    for param_key, param_children in mapping.items():
-        options = None
-        process_field = None
+    if parameters is None:
+        parameters = index_parameters(xml_group)
+    entries = compile_mapping(mapping_dict)
+    for param_key in mapping:
+        dest_key, options, process_field, param_children, is_rename = entries.get(
+            param_key, _PLAIN_ENTRY
+        )
         force_continue = False
-        dest_key = param_key
-        if isinstance(param_children, tuple):
-            dest_key = param_children[0]
-            param_children = param_children[1]
-        if isinstance(param_children, list):
-            options = param_children
-            param_children = None
-        if isinstance(param_children, str):
-            dest_key = param_children
-            param_children = None
+        if dest_key is None:
+            dest_key = param_key
+        if is_rename:
             connections = node["connections"]
-            for connection_name, connection in connections.items():
-                if connection_name == param_key:
-                    connections[dest_key] = connection
-                    connections.pop(connection_name)
-                    break
-        if callable(param_children):
-            process_field = param_children
-            param_children = None
-        parameter = xml_group.find(
-            ".//group_parameter[@name='parameters']"
-            "//group_parameter[@name='{param}']".format(param=dest_key)
-        )
+            if param_key in connections:
+                connections[dest_key] = connections[param_key]
+                del connections[param_key]
+        parameter = parameters.get(dest_key)
         # print param_key, dest_key, node
         if parameter is not None:
             enable_node = parameter.find("*[@name='enable']")
@@ -224,7 +283,30 @@ def iterate_mapping_recursive(mapping_dict, xml_group, node):
                     param_children = None
         if param_children:
             # if param_children is not None
-            iterate_mapping_recursive(param_children, xml_group, node)
+            iterate_mapping_recursive(param_children, xml_group, node, parameters)
+
+
+def compile_premap(premap):
+    """
+    Split the premap into the simple entries
+    (node type -> Katana type override or None)
+    and the entries with processing functions
+    (node type -> (preprocess, postprocess, type))
+    """
+    premap_simple = {}
+    premap_full = {}
+    for node_type, settings in premap.items():
+        preprocess_func = settings.get("preprocess")
+        postprocess_func = settings.get("postprocess")
+        if preprocess_func or postprocess_func:
+            premap_full[node_type] = (
+                preprocess_func,
+                postprocess_func,
+                settings.get("type"),
+            )
+        else:
+            premap_simple[node_type] = settings.get("type")
+    return premap_simple, premap_full
 
 
 def preprocess_node(node_name, premap):
@@ -233,11 +315,20 @@ def preprocess_node(node_name, premap):
     This is needed as some nodes (like ramp or bump) can be
     replaced by several other nodes for Katana.
     We return either one original node or several
-    nodes if something was replaced during preprocessing
+    nodes if something was replaced during preprocessing.
+    The premap is the result of compile_premap()
     """
+    premap_simple, premap_full = premap
     node_type = cmds.nodeType(node_name)
-    if node_type not in premap:
-        return None
+    if node_type in premap_simple:
+        # Most of the nodes need no processing functions
+        preprocess_func = postprocess_func = None
+        override_type = premap_simple[node_type]
+    else:
+        premap_settings = premap_full.get(node_type)
+        if premap_settings is None:
+            return None
+        preprocess_func, postprocess_func, override_type = premap_settings
     nodes = {}
     attributes = utils.node_attributes(node_name)
     connections = {}
@@ -245,13 +336,14 @@ def preprocess_node(node_name, premap):
         node_name, source=True, destination=False, connections=True, plugs=True
     )
     if node_connections:
-        for i in range(len(node_connections) / 2):
-            conn_to = node_connections[i * 2]
-            conn_to = conn_to[conn_to.find(".") + 1 :]
-            conn_from = node_connections[i * 2 + 1]
+        # The list is flat: [plug, connected plug, plug, connected plug, ...]
+        node_connections_iter = iter(node_connections)
+        for conn_to, conn_from in zip(node_connections_iter, node_connections_iter):
+            conn_to = conn_to.partition(".")[2]
+            conn_node, _, conn_port = conn_from.partition(".")
             connections[conn_to] = {
-                "node": conn_from[: conn_from.find(".")],
-                "original_port": conn_from[conn_from.find(".") + 1 :],
+                "node": conn_node,
+                "original_port": conn_port,
             }
 
     node = {
@@ -261,21 +353,37 @@ def preprocess_node(node_name, premap):
         "connections": connections,
         "renamings": {},
     }
-    premap_settings = premap[node_type]
-    for attr in ["type", "postprocess"]:
-        if premap_settings.get(attr):
-            node[attr] = premap_settings.get(attr)
-    if premap_settings.get("preprocess"):
-        preprocess_func = premap_settings.get("preprocess")
-        if preprocess_func:
-            preprocess_result = preprocess_func(node)
-            if preprocess_result:
-                nodes.update(preprocess_result)
+    if override_type:
+        node["type"] = override_type
+    if postprocess_func:
+        node["postprocess"] = postprocess_func
+    if preprocess_func:
+        preprocess_result = preprocess_func(node)
+        if preprocess_result:
+            nodes.update(preprocess_result)
     else:
         nodes[node["name"]] = node
     return nodes
 
 
+# Parsed Katana node templates per file path, reset on every export
+_TEMPLATES = {}
+
+
+def load_template(xml_path):
+    """
+    Get a fresh copy of the Katana node template
+    or None if there is no template file.
+    Every file is parsed only once per export
+    """
+    template = _TEMPLATES.get(xml_path)
+    if template is None:
+        if not os.path.isfile(xml_path):
+            return None
+        template = _TEMPLATES[xml_path] = ET.parse(xml_path).getroot()
+    return deepcopy(template)
+
+
 def process_node(node, renderer, mappings):
     """
     Start individual node processing
@@ -287,10 +395,11 @@ def process_node(node, renderer, mappings):
     if node_type not in mappings:
         return None
     xml_path = os.path.join(BASEDIR, "renderer", renderer, "nodes", node_type + ".xml")
-    if not os.path.isfile(xml_path) or mappings.get(node_type) is None:
+    if mappings.get(node_type) is None:
+        return None
+    root = load_template(xml_path)
+    if root is None:
         return None
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
     root.attrib["name"] = node_name
     xml_node = root.find("./group_parameter/string_parameter[@name='name']")
     if xml_node is not None:
@@ -481,6 +590,8 @@ def generate_xml(node_names, renderer=None):
         node_names = [node_names]
     if not node_names:
         return ""
+    _COMPILED_MAPPINGS.clear()
+    _TEMPLATES.clear()
     # Let's prepare the katana frame to enclose our nodes
     xml_root = ET.Element("katana")
     xml_root.attrib["release"] = "2.6v4"
@@ -551,8 +662,9 @@ def generate_xml(node_names, renderer=None):
     node_names = list(set(node_names))
     utils.unique_name(reset=node_names)
     preprocessed_nodes = {}
+    premap = compile_premap(renderer_module.premap)
     for node_name in node_names:
-        preprocessed_node = preprocess_node(node_name, premap=renderer_module.premap)
+        preprocessed_node = preprocess_node(node_name, premap=premap)
         if preprocessed_node:
             preprocessed_nodes.update(preprocessed_node)
     utils.rename_connections(preprocessed_nodes)
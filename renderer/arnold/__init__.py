@@ -24,22 +24,76 @@
 """
 
 import re
-import os
+from operator import itemgetter
 
 import maya.cmds as cmds
 
+try:
+    from types import MappingProxyType
+except ImportError:
+    # Python 2 has no read-only dictionary proxy
+    MappingProxyType = dict
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    # Python 2
+    from collections import Mapping
+
+try:
+    from sys import intern
+except ImportError:
+    # Python 2 has intern() as a builtin
+    pass
+
 from ... import utils, ET
 
+_COLOR_ENTRY_PREFIX = "colorEntryList["
+_UDIM_RE = re.compile(r"\.\d+\.")
+
+# Cached result of the MtoA version check, see _mtoa_is_ar5()
+_MTOA_IS_AR5 = None
+
+
+def _mtoa_is_ar5():
+    """
+    Check if the loaded MtoA is Arnold 5 based (MtoA 2.0+).
+    The plugin is queried only once per module load
+    """
+    global _MTOA_IS_AR5
+    if _MTOA_IS_AR5 is None:
+        version = cmds.pluginInfo("mtoa", query=True, version=True)
+        _MTOA_IS_AR5 = float(version[0]) >= 2.0
+    return _MTOA_IS_AR5
+
+
+# Texture path -> .tx path, the same textures are used by many shaders
+_TX_PATHS = {}
+
 
 def replace_tx(key, filepath):
     """
     Replace all texture paths with their .tx counterparts
     """
-    root, ext = os.path.splitext(filepath)
-    if ext:
-        ext = ".tx"
-    root = root.replace("\\", "/")
-    return root + ext
+    tx_path = _TX_PATHS.get(filepath)
+    if tx_path is None:
+        tx_path = filepath.replace("\\", "/")
+        root, dot, ext = tx_path.rpartition(".")
+        if dot and "/" not in ext and root.rpartition("/")[2].strip("."):
+            # Replace the extension of the file name only (dots in
+            # the folder names and leading dots of the file name don't count)
+            tx_path = root + ".tx"
+        _TX_PATHS[filepath] = tx_path
+    return tx_path
+
+
+_SUPPORTED_SAMPLER_OUTPUTS = frozenset(("facingRatio", "flippedNormal"))
+# two_sided colors replacing samplerInfo.flippedNormal.
+# Every node gets them in the Maya getAttr form of a list with a single tuple
+_TWO_SIDED_ATTRS = (
+    ("front", (1.0, 1.0, 1.0, 1.0)),
+    ("back", (0.0, 0.0, 0.0, 1.0)),
+)
 
 
 def preprocess_sampler(node):
@@ -54,13 +108,16 @@ def preprocess_sampler(node):
         node_name, source=False, destination=True, connections=True, plugs=True
     )
     if node_connections:
-        for i in range(len(node_connections) / 2):
-            conn_to = node_connections[i * 2]
-            conn_to = conn_to[conn_to.find(".") + 1 :]
-            conn_from = node_connections[i * 2 + 1]
+        # The list is flat: [plug, connected plug, plug, connected plug, ...]
+        node_connections_iter = iter(node_connections)
+        for conn_to, conn_from in zip(node_connections_iter, node_connections_iter):
+            conn_to = conn_to.partition(".")[2]
+            if conn_to not in _SUPPORTED_SAMPLER_OUTPUTS:
+                continue
+            conn_node, _, conn_port = conn_from.partition(".")
             connections[conn_to] = {
-                "node": conn_from[: conn_from.find(".")],
-                "original_port": conn_from[conn_from.find(".") + 1 :],
+                "node": conn_node,
+                "original_port": conn_port,
             }
     for connection_name in connections:
         if connection_name == "facingRatio":
@@ -78,10 +135,7 @@ def preprocess_sampler(node):
             sampler_info = {
                 "name": utility_name,
                 "type": "two_sided",
-                "attributes": {
-                    "front": [(1.0, 1.0, 1.0, 1.0)],
-                    "back": [(0.0, 0.0, 0.0, 1.0)],
-                },
+                "attributes": {name: [value] for name, value in _TWO_SIDED_ATTRS},
                 "connections": {},
                 "renamings": {node_name: {"name": utility_name},},
             }
@@ -89,6 +143,17 @@ def preprocess_sampler(node):
     return nodes
 
 
+# space_transform attributes replacing a tangent space normal bump
+_BUMP_NORMAL_ATTRS = {
+    "type": 2,  # normal
+    "bumpValue": (0, 0, 0),
+    "from": 4,  # tangent
+    "to": 0,  # world
+    # "color_to_signed": 1,
+    # "set_normal": 1,
+}
+
+
 def preprocess_bump(node):
     """
     Preprocess bump
@@ -102,16 +167,25 @@ def preprocess_bump(node):
     # {0: 'bump', 1: 'tangent', 2: 'object'}
     if attributes.get("bumpInterp") == 1:
         node["type"] = "space_transform"
-        attributes["type"] = 2  # normal
-        attributes["bumpValue"] = (0, 0, 0)
-        attributes["from"] = 4  # tangent
-        attributes["to"] = 0  # world
-        # attributes["color_to_signed"] = 1
-        # attributes["set_normal"] = 1
+        attributes.update(_BUMP_NORMAL_ATTRS)
     nodes[node_name] = node
     return nodes
 
 
+def _ramp_indices(node):
+    """
+    Get the sorted ramp point indices of the node.
+    Maya is queried once, the result is kept in the node cache
+    """
+    cache = node.setdefault("_cache", {})
+    indices = cache.get("indices")
+    if indices is None:
+        indices = cache["indices"] = sorted(
+            cmds.getAttr(node["name"] + ".colorEntryList", multiIndices=True) or []
+        )
+    return indices
+
+
 def preprocess_ramp(node):
     """
     Preprocess ramp
@@ -123,19 +197,20 @@ def preprocess_ramp(node):
     node_name = node["name"]
     color_entry_list = {}
     for connection_name, connection in node["connections"].items():
-        colorEntryMatch = re.search(r"color_entry_list\[(\d+)\]", connection_name)
-        if colorEntryMatch:
-            i = int(colorEntryMatch.group(1))
-            color_entry_list[i] = connection
-    # Get the number of ramp points in Maya
-    color_entry_list_size = cmds.getAttr(
-        "{node}.colorEntryList".format(node=node_name), size=True
-    )
+        if not connection_name.startswith(_COLOR_ENTRY_PREFIX):
+            continue
+        # colorEntryList[<index>]...
+        end = connection_name.find("]", len(_COLOR_ENTRY_PREFIX))
+        index = connection_name[len(_COLOR_ENTRY_PREFIX) : end]
+        if end > 0 and index.isdigit():
+            color_entry_list[int(index)] = connection
+    color_entry_list_indices = _ramp_indices(node)
+    color_entry_list_size = len(color_entry_list_indices)
     if color_entry_list_size < 2 and color_entry_list:
         # delete the whole ramp as it does nothing in Katana
         if color_entry_list_size == 1:
             # Get the only dictionary value as we know for sure there is one texture input
-            source_connection = color_entry_list.values()[0]
+            source_connection = next(iter(color_entry_list.values()))
             # Here we create a dummy node with no connections,
             # it will be ignored automatically as it's not of known types.
             # But it can be used to perform renames.
@@ -153,27 +228,16 @@ def preprocess_ramp(node):
             "mix": {"node": node_name, "original_port": None},
         }
         attributes = {}
-        color_entry_list_indices = cmds.getAttr(
-            node_name + ".color_entry_list", multiIndices=True
-        )
-        i = color_entry_list_indices[0]
-        if color_entry_list.get(i):
-            connections["input1"] = color_entry_list.get(i)
-        else:
-            attributes["input1"] = cmds.getAttr(
-                "{node}.color_entry_list[{index}].{param}".format(
-                    node=node_name, index=i, param="color"
-                )
-            )
-        i = color_entry_list_indices[1]
-        if color_entry_list.get(i):
-            connections["input2"] = color_entry_list.get(i)
-        else:
-            attributes["input2"] = cmds.getAttr(
-                "{node}.color_entry_list[{index}].{param}".format(
-                    node=node_name, index=i, param="color"
+        entry_prefix = node_name + ".colorEntryList["
+        # Mix the first two ramp points
+        for input_name, i in zip(("input1", "input2"), color_entry_list_indices):
+            entry = color_entry_list.get(i)
+            if entry:
+                connections[input_name] = entry
+            else:
+                attributes[input_name] = cmds.getAttr(
+                    entry_prefix + str(i) + "].color"
                 )
-            )
         mix = {
             "name": mix_name,
             "type": "mix",
@@ -190,6 +254,88 @@ def preprocess_ramp(node):
     return nodes
 
 
+# Maya ramp type: (Katana ramp type, Maya attribute used as the ramp input)
+_RAMP_TYPES = {
+    0: ("v", "vCoord"),
+    1: ("u", "uCoord"),
+    2: ("diagonal", None),
+    3: ("radial", None),
+    4: ("circular", None),
+    5: ("box", None),
+}
+# Maya ramp interpolation: Katana ramp interpolation, any other is 2
+_RAMP_INTERPOLATIONS = {
+    0: 0,  # None
+    4: 3,  # Smooth
+}
+
+
+_NUMBER_PARAMETER_XML = '<number_parameter name="i%d" value="%s"/>'
+
+
+# Copies emitted for the (first, middle, last) ramp points of each key.
+# Every copy is (index offset, use zero instead of the point value)
+_RAMP_PARAM_OFFSETS = {
+    "color": (((0, False), (3, False)), ((3, False),), ((3, False), (6, False))),
+    # rampFloat of the two textures mix: the point indices
+    "value": (((0, False), (1, False)), ((1, False),), ((1, False), (2, False))),
+    "position": (((0, True), (1, False)), ((1, False),), ((1, False), (2, False))),
+    "interpolation": (((0, False),), ((0, False),), ((0, False),)),
+}
+
+
+def _emit_ramp_params(value_node, dest_key, entries, tuple_size, interpolation):
+    """
+    Fill the ramp array parameter with the values of all the ramp points
+    in a single pass. The boundary points are emitted more than once.
+    All the elements are built by one XML parse call
+    """
+    offsets = _RAMP_PARAM_OFFSETS.get(dest_key)
+    if offsets is None:
+        return
+    head_offsets, body_offsets, tail_offsets = offsets
+    entry_count = len(entries)
+    if dest_key in ("color", "value"):
+        values = [entry[dest_key] for entry in entries]
+    elif dest_key == "position":
+        values = [
+            entries[i if i < entry_count else i - 2][dest_key]
+            for i in range(entry_count + 2)
+        ]
+    else:
+        values = [str(interpolation)] * (entry_count + 2)
+    zero_strs = ["0"] * tuple_size
+    parts = []
+    for i, value in enumerate(values):
+        val_strs = [
+            str(value[j] if tuple_size > 1 else value) for j in range(tuple_size)
+        ]
+        if i == 0:
+            point_offsets = head_offsets
+        elif i < entry_count - 1:
+            point_offsets = body_offsets
+        else:
+            point_offsets = tail_offsets
+        for offset, use_zero in point_offsets:
+            for j, val_str in enumerate(zero_strs if use_zero else val_strs):
+                parts.append(
+                    _NUMBER_PARAMETER_XML % (i * tuple_size + j + offset, val_str)
+                )
+    if parts:
+        value_node.extend(list(ET.fromstring("<root>" + "".join(parts) + "</root>")))
+
+
+def _parameter_children(parameter):
+    """
+    Index the children of a group parameter by name,
+    keeping the first match like parameter.find() does
+    """
+    children = {}
+    for child in parameter:
+        children.setdefault(child.get("name"), child)
+    return children
+
+
 def process_ramp(xml_group, node):
     """
     Process ramp and rampFloat
@@ -203,155 +349,83 @@ def process_ramp(xml_group, node):
         return
     connections = node["connections"]
     ramp_input = ""
-    if str(attributes["type"]) == "0":
-        ramp_type = "v"
-        ramp_input = attributes.get("vCoord", "0")
-        if connections.get("vCoord"):
-            ramp_type = "custom"
-            connections["input"] = connections["vCoord"]
-            del connections["vCoord"]
-    elif str(attributes["type"]) == "1":
-        ramp_type = "u"
-        ramp_input = attributes.get("uCoord", "0")
-        if connections.get("uCoord"):
-            ramp_type = "custom"
-            connections["input"] = connections["uCoord"]
-            del connections["uCoord"]
-    elif str(attributes["type"]) == "2":
-        ramp_type = "diagonal"
-    elif str(attributes["type"]) == "3":
-        ramp_type = "radial"
-    elif str(attributes["type"]) == "4":
-        ramp_type = "circular"
-    elif str(attributes["type"]) == "5":
-        ramp_type = "box"
-    else:
+    ramp_type_info = _RAMP_TYPES.get(int(attributes["type"]))
+    if ramp_type_info is None:
         utils.log.warning(
             'Can\'t translate ramp type for node "{name}"'.format(name=node_name)
         )
         ramp_type = "custom"
+    else:
+        ramp_type, coord_attr = ramp_type_info
+        if coord_attr:
+            ramp_input = attributes.get(coord_attr, "0")
+            if connections.get(coord_attr):
+                ramp_type = "custom"
+                connections["input"] = connections.pop(coord_attr)
     key_value = "color" if node_type == "ramp" else "value"
-    interpolation = 0 if attributes["interpolation"] == 0 else 3 if attributes["interpolation"] == 4 else 2
-    color_entry_list_size = 2 + cmds.getAttr(
-        "{node}.colorEntryList".format(node=node_name), size=True
-    )
-    color_entry_list = []
-    has_connections = False
-    color_entry_list_indices = sorted(
-        cmds.getAttr(node_name + ".colorEntryList", multiIndices=True)
+    interpolation = _RAMP_INTERPOLATIONS.get(attributes["interpolation"], 2)
+    color_entry_list_indices = _ramp_indices(node)
+    color_entry_list_size = 2 + len(color_entry_list_indices)
+    # Are there any textures connected instead of the ramp colors?
+    has_connections = any(
+        connection_name.startswith(_COLOR_ENTRY_PREFIX)
+        and connection_name.endswith("].color")
+        for connection_name in connections
     )
-    for i in color_entry_list_indices:
-        if utils.has_connection(
-            node, "colorEntryList[{index}].color".format(index=i)
-        ):
-            has_connections = True
-            break
-    index = 0
-    for i in color_entry_list_indices:
-        value_position = cmds.getAttr(
-            "{node}.colorEntryList[{index}].{param}".format(
-                node=node_name, index=i, param="position"
-            )
-        )
-        if has_connections:
-            value_color = index
-            index += 1
-        else:
-            value_color = cmds.getAttr(
-                "{node}.colorEntryList[{index}].{param}".format(
-                    node=node_name, index=i, param="color"
-                )
-            )
-            value_color = value_color[0]
-        color_entry_list.append({key_value: value_color, "position": value_position})
-    color_entry_list.sort(key=lambda x: x["position"])
-    for dest_key in ["input", "type", "position", key_value, "interpolation", "ramp"]:
-        parameter = xml_group.find(
-            ".//group_parameter[@name='{param}']".format(param=dest_key)
-        )
-        if parameter is None:
+    # Query all the ramp points at once instead of asking Maya
+    # for every position and color separately.
+    # We get a list of (position, r, g, b) in the multi index order
+    color_entry_values = cmds.getAttr(node_name + ".colorEntryList[*]") or []
+    if len(color_entry_values) != len(color_entry_list_indices):
+        # Not one value per ramp point, query the points one by one
+        entry_prefix = node_name + ".colorEntryList["
+        color_entry_values = [
+            (cmds.getAttr(entry_prefix + str(i) + "].position"),)
+            + tuple(cmds.getAttr(entry_prefix + str(i) + "].color")[0])
+            for i in color_entry_list_indices
+        ]
+    if has_connections:
+        color_entry_list = [
+            {key_value: index, "position": entry[0]}
+            for index, entry in enumerate(color_entry_values)
+        ]
+    else:
+        color_entry_list = [
+            {key_value: tuple(entry[1:]), "position": entry[0]}
+            for entry in color_entry_values
+        ]
+    color_entry_list.sort(key=itemgetter("position"))
+    # Index the group parameters once instead of searching
+    # the whole XML tree for every key.
+    # setdefault keeps the first match like xml_group.find() does
+    group_parameters = {}
+    for group_parameter in xml_group.iter("group_parameter"):
+        group_parameters.setdefault(group_parameter.get("name"), group_parameter)
+    # Single value parameters, unless they are connected
+    for dest_key, value in (
+        ("input", str(ramp_input)),
+        ("type", ramp_type),
+        ("ramp", str(color_entry_list_size)),
+    ):
+        parameter = group_parameters.get(dest_key)
+        if parameter is None or dest_key in connections:
             continue
-        enable_node = parameter.find("*[@name='enable']")
-        value_node = parameter.find("*[@name='value']")
-        if dest_key in ["input", "type", "ramp"]:
-            if not utils.has_connection(node, dest_key):
-                enable_node.attrib["value"] = "1"
-                if dest_key == "input":
-                    value = str(ramp_input)
-                elif dest_key == "type":
-                    value = ramp_type
-                elif dest_key == "ramp":
-                    value = str(color_entry_list_size)
-                value_node.attrib["value"] = value
+        parameter_children = _parameter_children(parameter)
+        parameter_children["enable"].attrib["value"] = "1"
+        parameter_children["value"].attrib["value"] = value
+    # Array parameters filled with all the ramp points
+    for dest_key in ("position", key_value, "interpolation"):
+        parameter = group_parameters.get(dest_key)
+        if parameter is None:
             continue
-        enable_node.attrib["value"] = "1"
+        parameter_children = _parameter_children(parameter)
+        parameter_children["enable"].attrib["value"] = "1"
+        value_node = parameter_children["value"]
         tuple_size = int(value_node.get("tupleSize", "0"))
         value_node.attrib["size"] = str(tuple_size * color_entry_list_size)
-        for i in range(color_entry_list_size - 2):
-            if dest_key == "interpolation":
-                value = str(interpolation)
-            else:
-                value = color_entry_list[i][dest_key]
-            if dest_key == "color":
-                if i == 0:
-                    for j in range(tuple_size):
-                        sub_value = ET.SubElement(value_node, "number_parameter")
-                        sub_value.attrib["name"] = "i" + str(i * tuple_size + j)
-                        sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
-                    for j in range(tuple_size):
-                        sub_value = ET.SubElement(value_node, "number_parameter")
-                        sub_value.attrib["name"] = "i" + str(i * tuple_size + j + 3)
-                        sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
-                elif i < (color_entry_list_size - 3):
-                    for j in range(tuple_size):
-                        sub_value = ET.SubElement(value_node, "number_parameter")
-                        sub_value.attrib["name"] = "i" + str(i * tuple_size + j + 3)
-                        sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
-                else:
-                    for j in range(tuple_size):
-                        sub_value = ET.SubElement(value_node, "number_parameter")
-                        sub_value.attrib["name"] = "i" + str(i * tuple_size + j + 3)
-                        sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
-                    for j in range(tuple_size):
-                        sub_value = ET.SubElement(value_node, "number_parameter")
-                        sub_value.attrib["name"] = "i" + str(i * tuple_size + j + 6)
-                        sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
-        for i in range(color_entry_list_size):
-            if dest_key == "interpolation":
-                value = str(interpolation)
-            else:
-                value = color_entry_list[i if i < (color_entry_list_size - 2) 
-                                            else (i - 2)][dest_key]
-            if dest_key == "interpolation":
-                for j in range(tuple_size):
-                    sub_value = ET.SubElement(value_node, "number_parameter")
-                    sub_value.attrib["name"] = "i" + str(i * tuple_size + j)
-                    sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
-            if dest_key == "position":
-                if i == 0:
-                    for j in range(tuple_size):
-                        sub_value = ET.SubElement(value_node, "number_parameter")
-                        sub_value.attrib["name"] = "i" + str(i * tuple_size + j)
-                        sub_value.attrib["value"] = str(0)
-                    for j in range(tuple_size):
-                        sub_value = ET.SubElement(value_node, "number_parameter")
-                        sub_value.attrib["name"] = "i" + str(i * tuple_size + j + 1)
-                        sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
-                elif i < (color_entry_list_size - 3):
-                    for j in range(tuple_size):
-                        sub_value = ET.SubElement(value_node, "number_parameter")
-                        sub_value.attrib["name"] = "i" + str(i * tuple_size + j + 1)
-                        sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
-                else:
-                    for j in range(tuple_size):
-                        sub_value = ET.SubElement(value_node, "number_parameter")
-                        sub_value.attrib["name"] = "i" + str(i * tuple_size + j + 1)
-                        sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
-                    for j in range(tuple_size):
-                        sub_value = ET.SubElement(value_node, "number_parameter")
-                        sub_value.attrib["name"] = "i" + str(i * tuple_size + j + 2)
-                        sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
-
+        _emit_ramp_params(
+            value_node, dest_key, color_entry_list, tuple_size, interpolation
+        )
 
 def preprocess_displacement(node):
     """
@@ -418,12 +492,18 @@ def preprocess_file(node):
     node["attributes"]["colorSpace"] = "linear"
     if node["attributes"]["uvTilingMode"] == 3:
         filename = node["attributes"]["filename"]
-        filename = re.sub(r"\.\d+\.", ".<UDIM>.", filename)
+        filename = _UDIM_RE.sub(".<UDIM>.", filename)
         node["attributes"]["filename"] = filename
     nodes[node_name] = node
     return nodes
 
 
+_AOV_WRITE_TYPES = frozenset(("aov_write_rgb", "aov_write_float"))
+
+# shadingEngine inputs to look for the surface shader, in priority order
+_SURFACE_KEYS = ("aiSurfaceShader", "surfaceShader", "aiVolumeShader", "volumeShader")
+
+
 def preprocess_network_material(node):
     """
     Preprocess shadingEngine node and remap correct attributes
@@ -432,11 +512,11 @@ def preprocess_network_material(node):
     node_name = node["name"]
     connections = node["connections"]
     new_connections = {}
-    for i in ["aiSurfaceShader", "surfaceShader", "aiVolumeShader", "volumeShader"]:
-        connection = connections.get(i)
-        if connection:
-            new_connections["arnoldSurface"] = connection
-            break
+    surface_connection = next(
+        (connections[i] for i in _SURFACE_KEYS if connections.get(i)), None
+    )
+    if surface_connection:
+        new_connections["arnoldSurface"] = surface_connection
     displacement_connection = connections.get("displacementShader")
     if displacement_connection:
         new_connections["arnoldDisplacement"] = displacement_connection
@@ -446,6 +526,39 @@ def preprocess_network_material(node):
     return nodes
 
 
+# Node name -> name of the shader at the end of its AOV passthroughs.
+# The module is reloaded on every export, so the cache lives for one run
+_TERMINAL_SHADERS = {}
+
+
+def _find_terminal_shader(node_name, all_nodes):
+    """
+    Follow the AOV passthroughs to the actual shader name.
+    Every walked AOV node remembers the result,
+    so chains shared by several materials are walked once
+    """
+    walked = set()
+    while node_name not in _TERMINAL_SHADERS:
+        shader_node = all_nodes.get(node_name)
+        if not shader_node:
+            terminal_name = None
+            break
+        if shader_node.get("type") not in _AOV_WRITE_TYPES or node_name in walked:
+            terminal_name = node_name
+            break
+        walked.add(node_name)
+        passthrough = shader_node["connections"].get("beauty")
+        if not passthrough:
+            terminal_name = node_name
+            break
+        node_name = passthrough.get("node")
+    else:
+        terminal_name = _TERMINAL_SHADERS[node_name]
+    for walked_name in walked:
+        _TERMINAL_SHADERS[walked_name] = terminal_name
+    return terminal_name
+
+
 def postprocess_network_material(node, all_nodes):
     """
     Rename the networkMaterial node and connect bump
@@ -453,14 +566,9 @@ def postprocess_network_material(node, all_nodes):
     nodes = {}
     arnold_surface = node["connections"].get("arnoldSurface")
     if arnold_surface:
-        shader_node = all_nodes.get(arnold_surface["node"])
-        while shader_node and shader_node.get("type") in [
-            "aov_write_rgb",
-            "aov_write_float",
-        ]:
-            passthrough = shader_node["connections"].get("beauty")
-            if passthrough:
-                shader_node = all_nodes.get(passthrough.get("node"))
+        shader_node = all_nodes.get(
+            _find_terminal_shader(arnold_surface["node"], all_nodes)
+        )
         if shader_node:
             shader_node_name = shader_node["name"]
             # Remove the output node to reinsert it back with the new name
@@ -475,7 +583,7 @@ def postprocess_network_material(node, all_nodes):
             node["renamings"] = {
                 material_name: {"name": shader_node_name},
             }
-            if not float(cmds.pluginInfo('mtoa', query = True, version = True)[0]) >= 2.0:
+            if not _mtoa_is_ar5():
                 bump = shader_node["connections"].get("normalCamera")
                 if bump:
                     node["connections"]["arnoldBump"] = bump
@@ -488,13 +596,22 @@ def process_network_material(xml_group, node):
     """
     Process NetworkMaterial to remove extra input ports
     """
-    for i in ["arnoldSurface", "arnoldDisplacement"]:
-        if i not in node["connections"]:
-            parameter = xml_group.find("./port[@name='{param}']".format(param=i))
+    unwanted = {
+        i
+        for i in ("arnoldSurface", "arnoldDisplacement")
+        if i not in node["connections"]
+    }
+    if not unwanted:
+        return
+    for parameter in xml_group.findall("./port"):
+        if parameter.get("name") in unwanted:
             xml_group.remove(parameter)
 
 
 def preprocess_multiplyDivide(node):
+    """
+    multiplyDivide to multiply, divide or pow depending on the operation
+    """
     nodes = {}
     node_name = node["name"]
     if node["attributes"]["operation"] == 2:
@@ -505,33 +622,50 @@ def preprocess_multiplyDivide(node):
         node["attributes"]["exponent"] = node["attributes"]["input2"]
     else:
         node["type"] = "multiply"
+    utils.log.debug('multiplyDivide "%s" -> %s', node_name, node["type"])
     nodes[node_name] = node
     return nodes
 
 
+# Special overrides requested by the artists
+_HAIR_OVERRIDES = {
+    "dualDepth": 1,
+    "diffuseIndirectStrength": 1,
+    "extraSamplesDiffuse": 2,
+    "extraSamplesGlossy": 2,
+}
+
+_MATERIAL_OVERRIDES = {
+    "specular1IndirectClamp": 1,
+    "specular2IndirectClamp": 1,
+    "specular1Distribution": "ggx",
+    "specular2Distribution": "ggx",
+}
+
+
 def override_hair_params(key, value):
     """
     Special overrides requested by the artists
     """
-    if key == "dualDepth":
-        value = 1
-    if key == "diffuseIndirectStrength":
-        value = 1
-    if key == "extraSamplesDiffuse":
-        value = 2
-    if key == "extraSamplesGlossy":
-        value = 2
-    return value
+    return _HAIR_OVERRIDES.get(key, value)
 
 
 def override_material_params(key, value):
     """
     Special overrides requested by the artists
     """
-    if key == "specular1IndirectClamp" or key == "specular2IndirectClamp":
-        value = 1
-    if key == "specular1Distribution" or key == "specular2Distribution":
-        value = "ggx"
+    return _MATERIAL_OVERRIDES.get(key, value)
+
+
+def _freeze(value):
+    """
+    Recursively turn dictionaries into read-only proxies
+    and lists into tuples
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
     return value
 
 
@@ -539,7 +673,7 @@ def override_material_params(key, value):
 # - preprocess
 # - postprocess (postprocess at level 0)
 # - type (override type)
-premap = {
+premap = _freeze({
     "displacementShader": {"preprocess": preprocess_displacement,},
     "alSurface": {},
     "alLayer": {},
@@ -595,12 +729,137 @@ premap = {
     "aiStandardHair": {"type": "standard_hair"},
     "aiSpaceTransform": {"type": "space_transform"},
     "aiClamp": {"type": "clamp"},
+})
+
+# Option lists shared by several mappings
+_BLEND_MODES = (
+    "Normal",
+    "Lighten",
+    "Darken",
+    "Multiply",
+    "Average",
+    "Add",
+    "Subtract",
+    "Difference",
+    "Negation",
+    "Exclusion",
+    "Screen",
+    "Overlay",
+    "Soft Light",
+    "Hard Light",
+    "Color Dodge",
+    "Color Burn",
+    "Linear Dodge",
+    "Linear Burn",
+    "Linear Light",
+    "Vivid Light",
+    "Pin Light",
+    "Hard Mix",
+    "Reflect",
+    "Glow",
+    "Phoenix",
+)
+_COMBINE_OP_BASE = (
+    "multiply 1*2",
+    "add 1+2",
+    "divide 1/2",
+    "subtract 1-2",
+    "lerp(1, 2, 3)",
+)
+_SPACES_WOP = ("world", "object", "Pref")
+_SPACES_WOPUV = _SPACES_WOP + ("UV",)
+_AXIS_ORDERS = ("XYZ", "XZY", "YXZ", "YZX", "ZXY", "ZYX")
+_TRANSFORM_SPACES = ("world", "object", "camera", "screen", "tangent")
+_TRIPLANAR_NORMALS = ("geometric", "smooth", "smooth-NoBump")
+_TRIPLANAR_TILINGS = ("regular", "cellnoise")
+
+# The remap parameters shared by the alShaders
+_RMP_ATTRS = {
+    "RMPinputMin": None,
+    "RMPinputMax": None,
+    "RMPcontrast": None,
+    "RMPcontrastPivot": None,
+    "RMPbias": None,
+    "RMPgain": None,
+    "RMPoutputMin": None,
+    "RMPoutputMax": None,
+    "RMPclampEnable": None,
+    "RMPthreshold": None,
+    "RMPclampMin": None,
+    "RMPclampMax": None,
 }
 
+
+def _with_rmp_attrs(attrs):
+    """
+    Add the shared remap parameters to a node mapping
+    """
+    result = dict(_RMP_ATTRS)
+    result.update(attrs)
+    return result
+
+
+def _none_attrs(*names):
+    """
+    Build a mapping of attributes that are all copied as is
+    """
+    return dict.fromkeys(names)
+
+
+# Inputs of alSwitchColor and alSwitchFloat
+_SWITCH_ATTRS = _none_attrs(
+    "inputA",
+    "inputB",
+    "inputC",
+    "inputD",
+    "inputE",
+    "inputF",
+    "inputG",
+    "inputH",
+    "mix",
+    "threshold",
+)
+
+# Attributes shared by the alCellNoise, alFlowNoise and alFractal noises
+_NOISE_ATTRS = _with_rmp_attrs({
+    "space": _SPACES_WOPUV,
+    "frequency": None,
+    "octaves": None,
+    "lacunarity": None,
+    "color1": None,
+    "color2": None,
+    "P": None,
+})
+
+
+def _with_noise_attrs(attrs):
+    """
+    Add the shared noise and remap parameters to a node mapping
+    """
+    result = dict(_NOISE_ATTRS)
+    result.update(attrs)
+    return result
+
+
+def _layer_attrs(blend_modes=None):
+    """
+    Build the mapping of the eight layers of alLayerColor and alLayerFloat:
+    layerN, layerNa and, if blend modes are given, layerNblend
+    """
+    attrs = {}
+    for i in range(1, 9):
+        layer = "layer" + str(i)
+        attrs[layer] = None
+        attrs[layer + "a"] = None
+        if blend_modes:
+            attrs[layer + "blend"] = blend_modes
+    return attrs
+
+
 # Mappings keywords:
 # - customColor
 # - customProcess
-mappings = {
+mappings = MappingProxyType({
     "alSurface": {
         "customColor": (0.2, 0.36, 0.1),
         "diffuseStrength": {
@@ -611,7 +870,7 @@ mappings = {
                 "backlightIndirectStrength": None,
             },
             "sssMix": {
-                "sssMode": ["cubic", "diffusion", "directional", "empirical"],
+                "sssMode": ("cubic", "diffusion", "directional", "empirical"),
                 "sssDensityScale": None,
                 "sssWeight1": {"sssRadius": None, "sssRadiusColor": None,},
                 "sssWeight2": {"sssRadius2": None, "sssRadiusColor2": None,},
@@ -631,7 +890,7 @@ mappings = {
             "specular1Roughness": None,
             "specular1Anisotropy": None,
             "specular1Rotation": None,
-            "specular1FresnelMode": ["dielectric", "metallic"],
+            "specular1FresnelMode": ("dielectric", "metallic"),
             "specular1Ior": None,
             "specular1Reflectivity": None,
             "specular1EdgeTint": None,
@@ -651,7 +910,7 @@ mappings = {
             "specular2Roughness": None,
             "specular2Anisotropy": None,
             "specular2Rotation": None,
-            "specular2FresnelMode": ["dielectric", "metallic"],
+            "specular2FresnelMode": ("dielectric", "metallic"),
             "specular2Ior": None,
             "specular2Reflectivity": None,
             "specular2EdgeTint": None,
@@ -703,7 +962,7 @@ mappings = {
             "KsColor": "Ks_color",
             "specularRoughness": "specular_roughness",
             "specularAnisotropy": "specular_anisotropy",
-            "specularDistribution": ("specular_distribution", ["beckmann", "ggx"]),
+            "specularDistribution": ("specular_distribution", ("beckmann", "ggx")),
             "specularRotation": "specular_rotation",
             "directSpecular": "direct_specular",
             "indirectSpecular": "indirect_specular",
@@ -736,14 +995,14 @@ mappings = {
         "emission": {"emissionColor": "emission_color",},
         "Ksss": {
             "KsssColor": "Ksss_color",
-            "sssProfile": ("sss_profile", ["empirical", "cubic"]),
+            "sssProfile": ("sss_profile", ("empirical", "cubic")),
             "sssRadius": "sss_radius",
         },
         "bounceFactor": "bounce_factor",
         "opacity": None,
     },
     "volume_collector": {
-        "scatteringSource": ("scattering_source", ["parameter", "channel"]),
+        "scatteringSource": ("scattering_source", ("parameter", "channel")),
         "scatteringChannel": "scattering_channel",
         "scattering": None,
         "scatteringColor": "scattering_color",
@@ -751,25 +1010,25 @@ mappings = {
         "anisotropy": None,
         "attenuationSource": (
             "attenuation_source",
-            ["parameter", "channel", "scattering"],
+            ("parameter", "channel", "scattering"),
         ),
         "attenuationChannel": "attenuation_channel",
         "attenuation": None,
         "attenuationColor": "attenuation_color",
         "attenuationIntensity": "attenuation_intensity",
-        "attenuationMode": ("attenuation_mode", ["absorption", "extinction"]),
-        "emissionSource": ("emission_source", ["parameter", "channel"]),
+        "attenuationMode": ("attenuation_mode", ("absorption", "extinction")),
+        "emissionSource": ("emission_source", ("parameter", "channel")),
         "emissionChannel": "emission_channel",
         "emission": None,
         "emissionColor": "emission_color",
         "emissionIntensity": "emission_intensity",
         "positionOffset": "position_offset",
-        "interpolation": ["closest", "trilinear", "tricubic"],
+        "interpolation": ("closest", "trilinear", "tricubic"),
     },
     "volume_sample_float": {
         "channel": None,
         "positionOffset": "position_offset",
-        "interpolation": ["closest", "trilinear", "tricubic"],
+        "interpolation": ("closest", "trilinear", "tricubic"),
         "inputMin": "input_min",
         "inputMax": "input_max",
         "contrast": None,
@@ -784,7 +1043,7 @@ mappings = {
     "volume_sample_rgb": {
         "channel": None,
         "positionOffset": "position_offset",
-        "interpolation": ["closest", "trilinear", "tricubic"],
+        "interpolation": ("closest", "trilinear", "tricubic"),
         "gamma": None,
         "hueShift": "hue_shift",
         "saturation": None,
@@ -801,54 +1060,28 @@ mappings = {
         "input1": None,
         "input2": None,
         "input3": None,
-        "combineOp": [
-            "multiply 1*2",
-            "add 1+2",
-            "divide 1/2",
-            "subtract 1-2",
-            "lerp(1, 2, 3)",
-            "dot(1, 2)",
-            "distance(1 -> 2)",
-            "cross(1, 2)",
-        ],
+        "combineOp": _COMBINE_OP_BASE
+        + ("dot(1, 2)", "distance(1 -> 2)", "cross(1, 2)"),
     },
     "alCombineFloat": {
         "input1": None,
         "input2": None,
         "input3": None,
-        "combineOp": [
-            "multiply 1*2",
-            "add 1+2",
-            "divide 1/2",
-            "subtract 1-2",
-            "lerp(1, 2, 3)",
-        ],
+        "combineOp": _COMBINE_OP_BASE,
     },
-    "alInputScalar": {
-        "input": [
+    "alInputScalar": _with_rmp_attrs({
+        "input": (
             "facing-ratio",
             "area",
             "face-index",
             "ray-length",
             "ray-depth",
             "User",
-        ],
+        ),
         "userName": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
-    },
+    }),
     "alInputVector": {
-        "input": [
+        "input": (
             "P",
             "Po",
             "N",
@@ -863,327 +1096,43 @@ mappings = {
             "uv",
             "User",
             "Custom",
-        ],
+        ),
         "userName": None,
         "vector": None,
-        "type": ["Point", "Vector"],
+        "type": ("Point", "Vector"),
         "matrix": None,
-        "coordinates": ["cartesian", "spherical", "normalized spherical"],
+        "coordinates": ("cartesian", "spherical", "normalized spherical"),
     },
-    "alCurvature": {
-        "mode": ["positive", "negative"],
+    "alCurvature": _with_rmp_attrs({
+        "mode": ("positive", "negative"),
         "samples": None,
         "sampleRadius": None,
         "traceSet": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
         "color1": None,
         "color2": None,
-    },
-    "alJitterColor": {
-        "input": None,
-        "minSaturation": None,
-        "maxSaturation": None,
-        "minGain": None,
-        "maxGain": None,
-        "minHueOffset": None,
-        "maxHueOffset": None,
-        "clamp": None,
-        "signal": None,
-    },
-    "alLayerColor": {
-        "layer1": None,
-        "layer1a": None,
-        "layer1blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer2": None,
-        "layer2a": None,
-        "layer2blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer3": None,
-        "layer3a": None,
-        "layer3blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer4": None,
-        "layer4a": None,
-        "layer4blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer5": None,
-        "layer5a": None,
-        "layer5blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer6": None,
-        "layer6a": None,
-        "layer6blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer7": None,
-        "layer7a": None,
-        "layer7blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-        "layer8": None,
-        "layer8a": None,
-        "layer8blend": [
-            "Normal",
-            "Lighten",
-            "Darken",
-            "Multiply",
-            "Average",
-            "Add",
-            "Subtract",
-            "Difference",
-            "Negation",
-            "Exclusion",
-            "Screen",
-            "Overlay",
-            "Soft Light",
-            "Hard Light",
-            "Color Dodge",
-            "Color Burn",
-            "Linear Dodge",
-            "Linear Burn",
-            "Linear Light",
-            "Vivid Light",
-            "Pin Light",
-            "Hard Mix",
-            "Reflect",
-            "Glow",
-            "Phoenix",
-        ],
-    },
-    "alLayerFloat": {
-        "layer1": None,
-        "layer1a": None,
-        "layer2": None,
-        "layer2a": None,
-        "layer3": None,
-        "layer3a": None,
-        "layer4": None,
-        "layer4a": None,
-        "layer5": None,
-        "layer5a": None,
-        "layer6": None,
-        "layer6a": None,
-        "layer7": None,
-        "layer7a": None,
-        "layer8": None,
-        "layer8a": None,
-    },
-    "alSwitchColor": {
-        "inputA": None,
-        "inputB": None,
-        "inputC": None,
-        "inputD": None,
-        "inputE": None,
-        "inputF": None,
-        "inputG": None,
-        "inputH": None,
-        "mix": None,
-        "threshold": None,
-    },
-    "alSwitchFloat": {
-        "inputA": None,
-        "inputB": None,
-        "inputC": None,
-        "inputD": None,
-        "inputE": None,
-        "inputF": None,
-        "inputG": None,
-        "inputH": None,
-        "mix": None,
-        "threshold": None,
-    },
+    }),
+    "alJitterColor": _none_attrs(
+        "input",
+        "minSaturation",
+        "maxSaturation",
+        "minGain",
+        "maxGain",
+        "minHueOffset",
+        "maxHueOffset",
+        "clamp",
+        "signal",
+    ),
+    "alLayerColor": _layer_attrs(_BLEND_MODES),
+    "alLayerFloat": _layer_attrs(),
+    "alSwitchColor": _SWITCH_ATTRS,
+    "alSwitchFloat": _SWITCH_ATTRS,
     "alTriplanar": {
         "customColor": (0.36, 0.25, 0.38),
         "input": None,
         "texture": replace_tx,
-        "space": ["world", "object", "Pref"],
-        "normal": ["geometric", "smooth", "smooth-NoBump"],
-        "tiling": ["regular", "cellnoise"],
+        "space": _SPACES_WOP,
+        "normal": _TRIPLANAR_NORMALS,
+        "tiling": _TRIPLANAR_TILINGS,
         "frequency": None,
         "mipMapBias": None,
         "blendSoftness": None,
@@ -1201,39 +1150,27 @@ mappings = {
         "rotjittery": None,
         "rotjitterz": None,
     },
-    "alRemapColor": {
-        "input": None,
-        "gamma": None,
-        "saturation": None,
-        "hueOffset": None,
-        "contrast": None,
-        "contrastPivot": None,
-        "gain": None,
-        "exposure": None,
-        "mask": None,
-    },
-    "alRemapFloat": {
+    "alRemapColor": _none_attrs(
+        "input",
+        "gamma",
+        "saturation",
+        "hueOffset",
+        "contrast",
+        "contrastPivot",
+        "gain",
+        "exposure",
+        "mask",
+    ),
+    "alRemapFloat": _with_rmp_attrs({
         "input": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
         "mask": None,
-    },
+    }),
     "alLayer": {
         "customColor": (0.2, 0.56, 0.1),
         "layer1": None,
         "layer2": None,
         "mix": None,
-        "debug": ["off", "layer1", "layer2", "mixer"],
+        "debug": ("off", "layer1", "layer2", "mixer"),
     },
     "clamp": {
         "input": None,
@@ -1263,7 +1200,7 @@ mappings = {
         "transmissionRolloff": None,
         "diffuseStrength": {
             "diffuseColor": None,
-            "diffuseScatteringMode": ["kajiya-kay", "dual-scattering"],
+            "diffuseScatteringMode": ("kajiya-kay", "dual-scattering"),
             "diffuseForward": None,
             "diffuseBack": None,
         },
@@ -1322,29 +1259,11 @@ mappings = {
         "amplitude": None,
         "scale": None,
         "offset": None,
-        "coordSpace": ("coord_space", ["world", "object", "Pref"]),
+        "coordSpace": ("coord_space", _SPACES_WOP),
     },
-    "alCellNoise": {
-        "space": ["world", "object", "Pref", "UV"],
-        "frequency": None,
-        "mode": ["features", "chips"],
+    "alCellNoise": _with_noise_attrs({
+        "mode": ("features", "chips"),
         "randomness": None,
-        "octaves": None,
-        "lacunarity": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
-        "color1": None,
-        "color2": None,
         "smoothChips": None,
         "randomChips": None,
         "chipColor1": None,
@@ -1357,87 +1276,48 @@ mappings = {
         "chipProb4": None,
         "chipColor5": None,
         "chipProb5": None,
-        "P": None,
-    },
+    }),
     "alFlake": {
-        "space": ["tangent", "world"],
+        "space": ("tangent", "world"),
         "amount": None,
         "size": None,
         "divergence": None,
         "P": None,
     },
-    "alFlowNoise": {
-        "space": ["world", "object", "Pref", "UV"],
-        "frequency": None,
-        "octaves": None,
-        "lacunarity": None,
+    "alFlowNoise": _with_noise_attrs({
         "gain": None,
         "angle": None,
         "advection": None,
         "turbulent": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
-        "color1": None,
-        "color2": None,
-        "P": None,
-    },
-    "alFractal": {
-        "mode": ["scalar", "vector"],
-        "space": ["world", "object", "Pref", "UV"],
+    }),
+    "alFractal": _with_noise_attrs({
+        "mode": ("scalar", "vector"),
         "scale": None,
-        "frequency": None,
         "time": None,
-        "octaves": None,
         "distortion": None,
-        "lacunarity": None,
         "gain": None,
         "turbulent": None,
-        "RMPinputMin": None,
-        "RMPinputMax": None,
-        "RMPcontrast": None,
-        "RMPcontrastPivot": None,
-        "RMPbias": None,
-        "RMPgain": None,
-        "RMPoutputMin": None,
-        "RMPoutputMax": None,
-        "RMPclampEnable": None,
-        "RMPthreshold": None,
-        "RMPclampMin": None,
-        "RMPclampMax": None,
-        "color1": None,
-        "color2": None,
-        "P": None,
-    },
+    }),
     "space_transform": {
         "input": None,
         "bumpValue": "input",
-        "type": ["point", "vector", "normal"],
-        "from": ["world", "object", "camera", "screen", "tangent"],
-        "to": ["world", "object", "camera", "screen", "tangent"],
+        "type": ("point", "vector", "normal"),
+        "from": _TRANSFORM_SPACES,
+        "to": _TRANSFORM_SPACES,
         "tangent": None,
         "normal": None,
         "normalize": None,
         "scale": None,
         "bumpDepth": "scale",
     },
-    "range": {
-        "input": None,
-        "input_min": None,
-        "input_max": None,
-        "output_min": None,
-        "output_max": None,
-        "smoothstep": None,
-    },
+    "range": _none_attrs(
+        "input",
+        "input_min",
+        "input_max",
+        "output_min",
+        "output_max",
+        "smoothstep",
+    ),
     "user_data_rgb": {
         "colorAttrName": "attribute", "defaultValue": "default",
     },
@@ -1485,7 +1365,7 @@ mappings = {
             'subsurfaceScale': 'subsurface_scale',
             'subsurfaceType': (
                 'subsurface_type',
-                ['diffusion', 'randomwalk', 'randomwalk_v2']),
+                ('diffusion', 'randomwalk', 'randomwalk_v2')),
             'subsurfaceAnisotropy': 'subsurface_anisotropy',
         },
         'coat': {
@@ -1545,7 +1425,7 @@ mappings = {
         "filename": replace_tx,
         # "useFrameExtension": "", # Retain
         # "frame": "", # Retain
-        "filter": ["closest", "bilinear", "bicubic", "smart_bicubic"],
+        "filter": ("closest", "bilinear", "bicubic", "smart_bicubic"),
         "mipmapBias": "mipmap_bias",
         "multiply": None,
         "offset": None,
@@ -1556,8 +1436,8 @@ mappings = {
         "uvcoords": None,
         "soffset": None,
         "toffset": None,
-        "swrap": ["periodic", "black", "clamp", "mirror", "file"],
-        "twrap": ["periodic", "black", "clamp", "mirror", "file"],
+        "swrap": ("periodic", "black", "clamp", "mirror", "file"),
+        "twrap": ("periodic", "black", "clamp", "mirror", "file"),
         "sscale": None,
         "tscale": None,
         "sflip": None,
@@ -1594,9 +1474,7 @@ mappings = {
         "strength": None,
         "tangent": None,
         "normal": None,
-        "order": (
-            "order", 
-            ["XYZ", "XZY", "YXZ", "YZX", "ZXY", "ZYX"]),
+        "order": ("order", _AXIS_ORDERS),
         "invertX": "invert_x",
         "invertY": "invert_y",
         "invertZ": "invert_z",
@@ -1735,4 +1613,81 @@ mappings = {
             'id8': None,
         }
     },
-}
+})
+
+
+def _intern_tree(value, memo=None):
+    """
+    Recursively intern all the strings of a mapping,
+    so the parameter names are shared objects compared by identity.
+    Containers shared between several mappings stay shared
+    """
+    if memo is None:
+        memo = {}
+    if isinstance(value, str):
+        return intern(value)
+    if not isinstance(value, (dict, tuple)):
+        return value
+    result = memo.get(id(value))
+    if result is None:
+        if isinstance(value, dict):
+            result = {
+                _intern_tree(k, memo): _intern_tree(v, memo)
+                for k, v in value.items()
+            }
+        else:
+            result = tuple(_intern_tree(v, memo) for v in value)
+        memo[id(value)] = result
+    return result
+
+
+def _share_identical_mappings(value, canon):
+    """
+    Replace structurally identical leaf mappings (no nested groups)
+    with a single shared read-only object
+    """
+    if not isinstance(value, dict):
+        return value
+    result = {k: _share_identical_mappings(v, canon) for k, v in value.items()}
+    key = tuple(sorted(result.items(), key=itemgetter(0)))
+    try:
+        hash(key)
+    except TypeError:
+        # Contains nested groups, can't be shared but is still read-only
+        return MappingProxyType(result)
+    return canon.setdefault(key, MappingProxyType(result))
+
+
+class _LazyMapping(Mapping):
+    """
+    Read-only node type mapping that interns and shares
+    the mapping of a node type on its first access
+    """
+
+    def __init__(self, raw_mappings):
+        self._raw = raw_mappings
+        self._cache = {}
+        self._intern_memo = {}
+        self._canon = {}
+
+    def __getitem__(self, node_type):
+        node_mapping = self._cache.get(node_type)
+        if node_mapping is None:
+            node_mapping = _share_identical_mappings(
+                _intern_tree(self._raw[node_type], self._intern_memo),
+                self._canon,
+            )
+            self._cache[node_type] = node_mapping
+        return node_mapping
+
+    def __contains__(self, node_type):
+        return node_type in self._raw
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
+
+
+mappings = _LazyMapping(mappings)
@@ -25,6 +25,7 @@
 
 import os
 import re
+from operator import itemgetter
 
 import maya.cmds as cmds
 
@@ -57,8 +58,9 @@ def preprocess_utility_pattern(node):
         utility_patterns[int(utility_match.group(1))] = connections.get(i)
     nodes[node_name] = node
     if len(utility_patterns) == 1:
-        connections["utilityPattern"] = utility_patterns.values()[0]
-        del connections["utilityPattern[{}]".format(utility_patterns.keys()[0])]
+        i, connection = next(iter(utility_patterns.items()))
+        connections["utilityPattern"] = connection
+        del connections["utilityPattern[{}]".format(i)]
     elif len(utility_patterns) > 1:
         # We should create a ShadingNodeArrayConnector
         connector_name = utils.unique_name(node_name + "Connector")
@@ -260,30 +262,23 @@ def process_ramp(xml_group, node):
     node_type = node["type"]
     if not node_type:
         return
-    color_entry_list_size = cmds.getAttr(
-        get_ramp_attr(node_name, "{node}.positions").format(node=node_name), size=True
+    # Translate the attribute names once for all the ramp points
+    positions_attr = get_ramp_attr(node_name, "{node}.positions").format(
+        node=node_name
     )
+    position_attr = get_ramp_attr(node_name, "{node}.positions[{index}]")
+    color_attr = get_ramp_attr(node_name, "{node}.colors[{index}]")
+    color_entry_list_size = cmds.getAttr(positions_attr, size=True)
     color_entry_list = []
     color_entry_list_indices = sorted(
-        cmds.getAttr(
-            get_ramp_attr(node_name, "{node}.positions").format(node=node_name),
-            multiIndices=True,
-        )
+        cmds.getAttr(positions_attr, multiIndices=True)
     )
     for i in color_entry_list_indices:
-        value_position = cmds.getAttr(
-            get_ramp_attr(node_name, "{node}.positions[{index}]").format(
-                node=node_name, index=i
-            )
-        )
-        value_color = cmds.getAttr(
-            get_ramp_attr(node_name, "{node}.colors[{index}]").format(
-                node=node_name, index=i
-            )
-        )
+        value_position = cmds.getAttr(position_attr.format(node=node_name, index=i))
+        value_color = cmds.getAttr(color_attr.format(node=node_name, index=i))
         value_color = value_color[0]
         color_entry_list.append({"colors": value_color, "positions": value_position})
-    color_entry_list.sort(key=lambda x: x["positions"])
+    color_entry_list.sort(key=itemgetter("positions"))
     for dest_key in ["positions", "colors"]:
         parameter = xml_group.find(
             ".//group_parameter[@name='{param}']".format(param=dest_key)
@@ -303,18 +298,19 @@ def process_ramp(xml_group, node):
                 sub_value.attrib["value"] = str(value[j] if tuple_size > 1 else value)
 
 
+# (Maya attribute, Maya value): Katana value
+_MANIFOLD_2D_OVERRIDES = {
+    ("primvarS", "u_uvSet"): "map2",
+    ("primvarT", "v_uvSet"): "",
+}
+
+
 def override_manifold_2d_params(key, value):
     """
     Special overrides.
     Katana expects UV Set name instead of 'u_uvSet'
     """
-    if key == "primvarS":
-        if value == "u_uvSet":
-            value = "map2"
-    elif key == "primvarT":
-        if value == "v_uvSet":
-            value = ""
-    return value
+    return _MANIFOLD_2D_OVERRIDES.get((key, value), value)
 
 
 def override_primvar_cs(key, value):
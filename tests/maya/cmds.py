@@ -0,0 +1,124 @@
+"""
+    Minimal stand-in for maya.cmds to run the exporter outside of Maya.
+    The scene is a plain dictionary filled by the tests:
+    SCENE["nodes"] is {node name: {"type": node type, "attrs": {attribute: value}}}
+    SCENE["connections"] is a list of (source plug, destination plug)
+"""
+
+import re
+
+SCENE = {"nodes": {}, "connections": [], "mtoa": "3.1.0"}
+
+
+def reset():
+    """
+    Start an empty scene
+    """
+    SCENE["nodes"].clear()
+    del SCENE["connections"][:]
+
+
+def create_node(name, node_type, **attributes):
+    """
+    Add a node with its attribute values in the getAttr form
+    """
+    SCENE["nodes"][name] = {"type": node_type, "attrs": attributes}
+
+
+def connect(source, dest):
+    """
+    Connect two plugs given as "node.attribute"
+    """
+    SCENE["connections"].append((source, dest))
+
+
+def _multi_indices(node, attr):
+    indices = set()
+    for key in SCENE["nodes"][node]["attrs"]:
+        match = re.match(re.escape(attr) + r"\[(\d+)\]", key)
+        if match:
+            indices.add(int(match.group(1)))
+    return sorted(indices)
+
+
+def nodeType(node):
+    if isinstance(node, list):
+        node = node[0]
+    return SCENE["nodes"][node]["type"]
+
+
+def listAttr(node):
+    return [key for key in SCENE["nodes"][node]["attrs"] if "[" not in key]
+
+
+def pluginInfo(name, query=False, version=False):
+    return SCENE["mtoa"]
+
+
+def attributeQuery(attr, node=None, exists=False):
+    if attr in SCENE["nodes"][node]["attrs"]:
+        return True
+    prefix = node + "." + attr
+    return any(dest.startswith(prefix) for _, dest in SCENE["connections"])
+
+
+def getAttr(plug, size=False, multiIndices=False):
+    node, _, attr = plug.partition(".")
+    attributes = SCENE["nodes"][node]["attrs"]
+    if size:
+        return len(_multi_indices(node, attr))
+    if multiIndices:
+        return _multi_indices(node, attr) or None
+    if attr.endswith("[*]"):
+        # Only the ramp colorEntryList is queried this way
+        attr = attr[:-3]
+        return [
+            (attributes["%s[%d].position" % (attr, i)],)
+            + tuple(attributes["%s[%d].color" % (attr, i)][0])
+            for i in _multi_indices(node, attr)
+        ]
+    if attr in attributes:
+        return attributes[attr]
+    raise RuntimeError("No object matches name: " + plug)
+
+
+def listConnections(
+    node, source=True, destination=True, connections=False, plugs=False, type=None
+):
+    if isinstance(node, list):
+        result = []
+        for node_name in node:
+            result += (
+                listConnections(node_name, source, destination, connections, plugs)
+                or []
+            )
+        return result or None
+    node, _, attr = node.partition(".")
+    result = []
+    for source_plug, dest_plug in SCENE["connections"]:
+        source_node, _, source_attr = source_plug.partition(".")
+        dest_node, _, dest_attr = dest_plug.partition(".")
+        if (
+            source
+            and dest_node == node
+            and (
+                not attr
+                or dest_attr == attr
+                or dest_attr.startswith(attr + "[")
+                or dest_attr.startswith(attr + ".")
+            )
+        ):
+            if connections:
+                result += [dest_plug, source_plug if plugs else source_node]
+            else:
+                result.append(source_plug if plugs else source_node)
+        if destination and source_node == node and (not attr or source_attr == attr):
+            if connections:
+                result += [source_plug, dest_plug if plugs else dest_node]
+            else:
+                result.append(dest_plug if plugs else dest_node)
+    return result or None
+
+
+def ls(selection=False):
+    return []
@@ -0,0 +1,319 @@
+"""
+    Regression tests of the Arnold mapping and ramp output.
+    They run the exporter against the fake maya.cmds next to them,
+    using Maya's Python 2:
+    python -m unittest discover tests
+"""
+
+import imp
+import os
+import sys
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, TESTS_DIR)
+
+import maya.cmds as cmds
+
+# The repository directory is the maya2katana package itself
+if "maya2katana" not in sys.modules:
+    imp.load_module(
+        "maya2katana",
+        None,
+        os.path.dirname(TESTS_DIR),
+        ("", "", imp.PKG_DIRECTORY),
+    )
+
+from maya2katana import ET
+from maya2katana.renderer import arnold
+
+clip = sys.modules["maya2katana.clip"]
+
+
+def export(node_names):
+    """
+    Export the nodes and parse the resulting Katana XML
+    """
+    return ET.fromstring(clip.generate_xml(node_names, renderer="arnold"))
+
+
+def find_node(xml_root, node_name):
+    for xml_node in xml_root.iter("node"):
+        if xml_node.get("name") == node_name:
+            return xml_node
+    raise KeyError(node_name)
+
+
+def find_parameter(xml_root, node_name, param):
+    """
+    Get the (enable, value element) of the Arnold node parameter
+    """
+    parameters = find_node(xml_root, node_name).find(
+        ".//group_parameter[@name='parameters']"
+    )
+    parameter = parameters.find("group_parameter[@name='{}']".format(param))
+    return (
+        parameter.find("*[@name='enable']").get("value"),
+        parameter.find("*[@name='value']"),
+    )
+
+
+def array_values(xml_root, node_name, param):
+    """
+    Get the enabled array parameter as a list of (element name, value)
+    """
+    enable, value_node = find_parameter(xml_root, node_name, param)
+    assert enable == "1", (node_name, param)
+    return [(child.get("name"), child.get("value")) for child in value_node]
+
+
+def port_source(xml_root, node_name, port):
+    return (
+        find_node(xml_root, node_name)
+        .find("port[@name='{}']".format(port))
+        .get("source")
+    )
+
+
+def create_file(name, path):
+    cmds.create_node(
+        name,
+        "file",
+        fileTextureName=path,
+        colorGain=[(1, 1, 1)],
+        colorOffset=[(0, 0, 0)],
+        uvTilingMode=0,
+    )
+
+
+def create_ramp(name, points, **attributes):
+    """
+    Add a ramp from {colorEntryList index: (position, color)}
+    """
+    for i, (position, color) in points.items():
+        prefix = "colorEntryList[%d]." % i
+        attributes[prefix + "position"] = position
+        attributes[prefix + "color"] = [color]
+    cmds.create_node(name, "ramp", **attributes)
+
+
+class CompileTest(unittest.TestCase):
+    def test_compile_mapping(self):
+        def process(key, value):
+            return value
+
+        nested = {"a": None}
+        mapping = {
+            "plain": None,
+            "renamed": "renamed_param",
+            "enum": ("off", "on"),
+            "renamed_enum": ("renamed_enum_param", ("off", "on")),
+            "processed": process,
+            "group": nested,
+        }
+        entries = clip.compile_mapping(mapping)
+        self.assertEqual(entries["plain"], (None, None, None, None, False))
+        self.assertEqual(entries["renamed"], ("renamed_param", None, None, None, True))
+        self.assertEqual(entries["enum"], (None, ("off", "on"), None, None, False))
+        self.assertEqual(
+            entries["renamed_enum"],
+            ("renamed_enum_param", ("off", "on"), None, None, False),
+        )
+        self.assertEqual(entries["processed"], (None, None, process, None, False))
+        self.assertIs(entries["group"][3], nested)
+        # Compiled once per mapping dictionary
+        self.assertIs(clip.compile_mapping(mapping), entries)
+
+    def test_compile_premap(self):
+        premap_simple, premap_full = clip.compile_premap(arnold.premap)
+        self.assertEqual(premap_simple["aiWriteColor"], "aov_write_rgb")
+        self.assertEqual(premap_full["ramp"], (arnold.preprocess_ramp, None, None))
+        self.assertFalse(set(premap_simple) & set(premap_full))
+        self.assertEqual(set(premap_simple) | set(premap_full), set(arnold.premap))
+
+
+class MappingTest(unittest.TestCase):
+    def setUp(self):
+        cmds.reset()
+
+    def check_mapping(self, mapping, path):
+        """
+        Check the structure of a handwritten node mapping
+        """
+        groups = (dict, arnold.MappingProxyType)
+        self.assertIsInstance(mapping, groups, path)
+        for key, value in mapping.items():
+            key_path = path + (key,)
+            if key == "customColor":
+                self.assertIsInstance(value, tuple, key_path)
+                self.assertEqual(len(value), 3, key_path)
+            elif key == "customMapping":
+                self.assertIsInstance(value, bool, key_path)
+            elif isinstance(value, groups):
+                self.check_mapping(value, key_path)
+            elif isinstance(value, tuple):
+                self.assertTrue(value, key_path)
+                options = value
+                if isinstance(value[-1], (list, tuple)):
+                    # (Katana parameter name, options)
+                    self.assertEqual(len(value), 2, key_path)
+                    self.assertIsInstance(value[0], str, key_path)
+                    options = value[1]
+                for option in options:
+                    self.assertIsInstance(option, str, key_path)
+            else:
+                self.assertTrue(
+                    value is None or isinstance(value, str) or callable(value),
+                    (key_path, type(value)),
+                )
+
+    def test_mapping_structure(self):
+        for node_type in arnold.mappings:
+            self.check_mapping(arnold.mappings[node_type], (node_type,))
+
+    def test_renames_and_values(self):
+        cmds.create_node("SG1", "shadingEngine")
+        cmds.create_node(
+            "std1",
+            "aiStandardSurface",
+            baseColor=[(0.5, 0.2, 0.1)],
+            specularRoughness=0.3,
+            normalCamera=[(0, 0, 0)],
+        )
+        cmds.create_node("bump1", "aiBump2d", bumpHeight=0.2)
+        create_file("file1", "/tex/wood.png")
+        cmds.connect("std1.outColor", "SG1.surfaceShader")
+        cmds.connect("file1.outColor", "std1.baseColor")
+        cmds.connect("bump1.outValue", "std1.normalCamera")
+        xml_root = export(["SG1"])
+        enable, value_node = find_parameter(xml_root, "std1_out", "specular_roughness")
+        self.assertEqual((enable, value_node.get("value")), ("1", "0.3"))
+        self.assertEqual(port_source(xml_root, "std1_out", "base_color"), "file1.out")
+        enable, value_node = find_parameter(xml_root, "bump1", "bump_height")
+        self.assertEqual((enable, value_node.get("value")), ("1", "0.2"))
+        enable, value_node = find_parameter(xml_root, "file1", "filename")
+        self.assertEqual((enable, value_node.get("value")), ("1", "/tex/wood.tx"))
+
+    def test_options(self):
+        cmds.create_node("lc", "alLayerColor", layer1blend=3, layer2blend=5)
+        cmds.create_node(
+            "tri", "alTriplanar", texture="/tex/x.tif", space=1, normal=2, tiling=1
+        )
+        cmds.connect("tri.outColor", "lc.layer1")
+        xml_root = export(["lc", "tri"])
+        for node_name, param, value in (
+            ("lc", "layer1blend", "Multiply"),
+            ("lc", "layer2blend", "Add"),
+            ("tri", "space", "object"),
+            ("tri", "normal", "smooth-NoBump"),
+            ("tri", "tiling", "cellnoise"),
+        ):
+            enable, value_node = find_parameter(xml_root, node_name, param)
+            self.assertEqual((enable, value_node.get("value")), ("1", value))
+
+
+class RampTest(unittest.TestCase):
+    def setUp(self):
+        cmds.reset()
+
+    def create_color_ramp(self):
+        create_ramp(
+            "ramp1",
+            {
+                0: (0.0, (1.0, 0.0, 0.0)),
+                2: (0.7, (0.0, 1.0, 0.0)),
+                5: (0.3, (0.0, 0.0, 1.0)),
+            },
+            type=0,
+            interpolation=1,
+            vCoord=0.25,
+            uCoord=0.0,
+        )
+
+    def test_color_ramp(self):
+        self.create_color_ramp()
+        xml_root = export(["ramp1"])
+        enable, value_node = find_parameter(xml_root, "ramp1", "ramp")
+        self.assertEqual((enable, value_node.get("value")), ("1", "5"))
+        enable, value_node = find_parameter(xml_root, "ramp1", "input")
+        self.assertEqual((enable, value_node.get("value")), ("1", "0.25"))
+        self.assertEqual(
+            array_values(xml_root, "ramp1", "position"),
+            [
+                ("i0", "0"),
+                ("i1", "0.0"),
+                ("i2", "0.3"),
+                ("i3", "0.7"),
+                ("i4", "0.7"),
+                ("i4", "0.3"),
+                ("i5", "0.3"),
+                ("i5", "0.7"),
+                ("i6", "0.7"),
+            ],
+        )
+        # The points are sorted by position, the boundary colors are doubled
+        colors = [value for _, value in array_values(xml_root, "ramp1", "color")]
+        self.assertEqual(
+            colors,
+            ["1.0", "0.0", "0.0"] * 2
+            + ["0.0", "0.0", "1.0"]
+            + ["0.0", "1.0", "0.0"] * 2,
+        )
+        self.assertEqual(
+            array_values(xml_root, "ramp1", "interpolation"),
+            [("i%d" % i, "2") for i in range(5)],
+        )
+
+    def test_ramp_points_queried_one_by_one(self):
+        self.create_color_ramp()
+        expected_root = export(["ramp1"])
+        get_attr = cmds.getAttr
+
+        def flat_get_attr(plug, **kwargs):
+            # A single flat list instead of one tuple per ramp point
+            value = get_attr(plug, **kwargs)
+            if plug.endswith("[*]"):
+                value = [number for entry in value for number in entry]
+            return value
+
+        cmds.getAttr = flat_get_attr
+        self.addCleanup(setattr, cmds, "getAttr", get_attr)
+        xml_root = export(["ramp1"])
+        for param in ("position", "color", "interpolation"):
+            self.assertEqual(
+                array_values(xml_root, "ramp1", param),
+                array_values(expected_root, "ramp1", param),
+            )
+
+    def test_two_textures_mix(self):
+        create_ramp(
+            "ramp2",
+            {1: (0.9, (1.0, 1.0, 0.0)), 3: (0.1, (0.0, 1.0, 1.0))},
+            type=1,
+            interpolation=4,
+            vCoord=0.0,
+            uCoord=0.5,
+        )
+        create_file("f3", "a.png")
+        create_file("f4", "b.png")
+        cmds.connect("f3.outColor", "ramp2.colorEntryList[1].color")
+        cmds.connect("f4.outColor", "ramp2.colorEntryList[3].color")
+        xml_root = export(["ramp2"])
+        # The ramp becomes a rampFloat mixing the two textures
+        self.assertEqual(port_source(xml_root, "ramp2Mix", "input1"), "f3.out")
+        self.assertEqual(port_source(xml_root, "ramp2Mix", "input2"), "f4.out")
+        self.assertEqual(port_source(xml_root, "ramp2Mix", "mix"), "ramp2.out")
+        _, value_node = find_parameter(xml_root, "ramp2", "value")
+        self.assertEqual(value_node.get("size"), str(len(value_node)))
+        self.assertEqual(
+            array_values(xml_root, "ramp2", "value"),
+            [("i0", "1"), ("i1", "1"), ("i2", "0"), ("i3", "0")],
+        )
+        self.assertEqual(
+            array_values(xml_root, "ramp2", "interpolation"),
+            [("i%d" % i, "3") for i in range(4)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
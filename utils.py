@@ -76,15 +76,15 @@ def get_out_connection(connection):
     if not connection:
         return ""
     out_port = [strip_namespace(connection["node"])]
-    if connection.get("original_port").startswith(("outDisplacement", "outEigenvalue")):
-        out_port.append(connection.get("original_port"))
-    elif connection.get("original_port").startswith("out"):
+    # No original port means the default output of the node
+    port = connection.get("original_port") or "out"
+    if port.startswith(("outDisplacement", "outEigenvalue")):
+        out_port.append(port)
+    elif port.startswith("out"):
         out_port.append("out")
     else:
-        out_port.append(connection.get("original_port"))
-    original_port = re.findall(
-        r"^out(?:Color|Value)([RGBAXYZ])", connection.get("original_port") or ""
-    )
+        out_port.append(port)
+    original_port = re.findall(r"^out(?:Color|Value)([RGBAXYZ])", port)
     if original_port:
         out_port.append(original_port[0].lower())
     return ".".join(out_port)